@@ -1,5 +1,6 @@
 from collections.abc import MutableMapping, MutableSequence, Sequence
 from dataclasses import dataclass, field
+from itertools import combinations
 from typing import Protocol
 
 
@@ -9,31 +10,43 @@ class StringSink(Protocol):
 
 
 class ConfigBlock(object):
+    """
+    Nested blocks append directly to the sink of the outermost block, with
+    their indentation computed once up front instead of on every line.
+    """
     INDENT = '    '
 
-    def __init__(self, output: StringSink, name: str) -> None:
-        self.output = output
+    def __init__(self, output: 'StringSink | ConfigBlock', name: str) -> None:
+        if isinstance(output, ConfigBlock):
+            self.output: StringSink = output.output
+            self.outer_indent = output.inner_indent
+        else:
+            self.output = output
+            self.outer_indent = ''
+        self.inner_indent = self.outer_indent + self.INDENT
         self.name = name
 
     def __enter__(self):
-        self.write_no_indent(f'{self.name} {{\n')
+        self.write_no_indent(self.name)
+        self.output.append(' {\n')
         return self
 
     def __exit__(self, *ignore_exception) -> None:
         self.write_no_indent('}\n')
 
     def write_no_indent(self, content: str) -> None:
-        return self.output.append(content)
+        self.output.append(self.outer_indent)
+        self.output.append(content)
 
     def write(self, text: str) -> None:
-        content = f'{self.INDENT}{text}'
-        if not content.endswith('\n'):
-            content += '\n'
-
-        self.write_no_indent(content)
+        self.output.append(self.inner_indent)
+        self.output.append(text)
+        if not text.endswith('\n'):
+            self.output.append('\n')
 
     def append(self, line: str) -> None:
-        self.output.append(f'{self.INDENT}{line}')
+        self.output.append(self.inner_indent)
+        self.output.append(line)
 
 
 @dataclass
@@ -71,11 +84,10 @@ def drbd_config(resource: DRBDResource) -> str:
         for node_id, n in enumerate(resource.nodes):
             _config_host(resource_block, resource, node_id, n)
 
-        for start, n1 in enumerate(resource.nodes):
-            for n2 in resource.nodes[start + 1:]:
-                with ConfigBlock(resource_block, 'connection') as connection_block:
-                    _config_one_host_addr(connection_block, resource, n1)
-                    _config_one_host_addr(connection_block, resource, n2)
+        for n1, n2 in combinations(resource.nodes, 2):
+            with ConfigBlock(resource_block, 'connection') as connection_block:
+                _config_one_host_addr(connection_block, resource, n1)
+                _config_one_host_addr(connection_block, resource, n2)
 
     return "".join(text)
 
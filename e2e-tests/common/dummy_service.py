@@ -24,7 +24,7 @@ ExecStart=/bin/sh "{dummy_service_script_path}" %I
 
 dummy_service_script = f'''\
 # Ensure that DRBD is writable by writing a fixed pattern.
-cat /dev/zero | tr '\0' a | dd of="$1" bs=4K count=1 oflag=direct || exit 1
+cat /dev/zero | tr '\\0' a | dd of="$1" bs=4K count=1 oflag=direct || exit 1
 
 # Notify test suite.
 echo "$1" >> {dummy_service_status_path}
@@ -36,16 +36,29 @@ def dummy_service_unit(device: str) -> str:
 
 
 def systemd_escape(s: str) -> str:
+    if s.isascii():
+        return s.translate(_ESCAPE_TABLE)
     return ''.join([_escape_code_point(c) for c in s])
 
 
 def _escape_code_point(c: str) -> str:
+    escaped = _ESCAPE_TABLE.get(ord(c))
+    if escaped is not None:
+        return escaped
+    return ''.join([f'\\x{b:02x}' for b in c.encode('utf-8')])
+
+
+def _escape_ascii(c: str) -> str:
     match c:
         case '/':
             return '-'
         case x if c in ':_.' + string.ascii_letters + string.digits:
             return x
         case _:
-            return ''.join([f'\\x{b:02x}' for b in c.encode('utf-8')])
+            return f'\\x{ord(c):02x}'
     # For mypy
     return ''
+
+
+# Escape sequences for all of ASCII, so that common paths go through str.translate
+_ESCAPE_TABLE = {i: _escape_ascii(chr(i)) for i in range(128)}
@@ -1,8 +1,8 @@
-from collections.abc import MutableMapping, MutableSequence
+from collections.abc import Mapping, MutableMapping, MutableSequence, Sequence
 from dataclasses import dataclass, field
 from typing import cast
 
-import toml
+import tomli_w
 
 
 @dataclass
@@ -56,26 +56,33 @@ class ReactorConfig(object):
     prometheus: MutableSequence[Prometheus] = field(default_factory=list)
 
 
-def _rename_key(k: str) -> str:
+def _plain_dict(d: Mapping) -> dict:
     """
     Class members use Python style names internally. For serialization to toml
-    we need to rename them.
+    we need to rename them. TOML has no null, leave unset members out entirely.
     """
-    return k.replace("_", "-")
+    return {k.replace("_", "-"): to_plain(v) for k, v in d.items() if v is not None}
 
 
 def to_plain(item):
-    match item:
-        case dict():
-            return {_rename_key(k): to_plain(v) for k, v in item.items()}
-        case list() | tuple():
-            return [to_plain(x) for x in item]
-        case object(__dict__=d):
-            return to_plain(d)
-        case _:
-            return item
+    t = type(item)
+    if t is dict:
+        return _plain_dict(item)
+    if t is list or t is tuple:
+        return [to_plain(x) for x in item]
+    if t is str or t is bool or t is int or t is float:
+        return item
+    # subclasses and other container types, before anything that merely has a __dict__
+    if isinstance(item, Mapping):
+        return _plain_dict(item)
+    if isinstance(item, Sequence) and not isinstance(item, str):
+        return [to_plain(x) for x in item]
+    d = getattr(item, "__dict__", None)
+    if d is not None:
+        return _plain_dict(d)
+    return item
 
 
 def dump_reactor_config(config: ReactorConfig):
     d = to_plain(config)
-    return toml.dumps(cast(dict, d))
+    return tomli_w.dumps(cast(dict, d))
@@ -1,13 +1,19 @@
 import time
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import as_completed, ThreadPoolExecutor
+import contextlib
+import functools
+import hashlib
 from io import StringIO
-import pipes
+import shlex
 import socket
+import subprocess
 from subprocess import CalledProcessError
 import sys
-from typing import cast, Callable, TextIO
+import threading
+from typing import cast, Callable, TextIO, TypeVar
 
-from lbpytest.controlmaster import SSH
+from lbpytest.controlmaster import SSH, TimeoutException
 
 from .drbd_config import DRBDVolume, drbd_config, DRBDNode, DRBDResource
 from . import dummy_service
@@ -16,22 +22,59 @@ from .reactor_config import dump_reactor_config, ReactorConfig
 
 lvm_volume_group = 'scratch'
 
+# sshd default for the number of sessions multiplexed over one connection
+ssh_max_sessions = 10
+
+T = TypeVar('T')
+R = TypeVar('R')
+
 
 def log(text: str) -> None:
     print(text, file=sys.stderr)
     sys.stderr.flush()
 
 
+@functools.cache
+def resolve(name: str) -> str:
+    """
+    Resolve a host name to its IPv4 address once per process.
+    """
+    return socket.getaddrinfo(name, None, family=socket.AF_INET)[0][4][0]
+
+
+def on_nodes(fn: Callable[[T], R], nodes: Iterable[T]) -> list[R]:
+    """
+    Call fn for all nodes in parallel. The calls mostly wait for SSH, so
+    threads are good enough.
+
+    :returns: the results, in the order of the nodes
+    :raise Exception: the exception of the first failing node in the given order, after all calls finished
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return []
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        return list(executor.map(fn, nodes))
+
+
 class Cluster(object):
     def __init__(self, hostnames) -> None:
-        self.nodes = [Node(name) for name in hostnames]
+        self.nodes = on_nodes(Node, hostnames)
+
+    def close(self) -> None:
+        for node in self.nodes:
+            node.close()
 
 
 class Node(object):
     def __init__(self, name) -> None:
         self.name = name
         self.ssh = SSH(self.name, timeout=30)
-        self.addr = socket.gethostbyname(name)
+        # all commands (including the long running waits of wait_for()) share the ControlMaster
+        # connection, stay below its session limit instead of running into sshd refusing sessions
+        # when many commands run in parallel
+        self.sessions = threading.BoundedSemaphore(ssh_max_sessions - 1)
+        self.addr = resolve(name)
         self.hostname = cast(str, self.run(['uname', '-n'], return_stdout=True))
 
         install_dummy_service(self)
@@ -39,6 +82,13 @@ class Node(object):
     def __repr__(self) -> str:
         return self.name
 
+    def close(self) -> None:
+        """
+        Tear down the SSH ControlMaster connection that all commands on this
+        node are multiplexed over.
+        """
+        self.ssh.close()
+
     def run(self, cmd: Iterable[str], *,
             quote: bool = True,
             catch: bool = False,
@@ -64,47 +114,144 @@ class Node(object):
         :raise CalledProcessError: when the command fails (unless catch is True)
         """
 
-        stdout_capture: StringIO | None = None
-
-        if return_stdout:
-            stdout_capture = StringIO()
-            stdout = stdout_capture
-
         if quote:
-            cmd_string = ' '.join(pipes.quote(str(x)) for x in cmd)
+            cmd_string = shell_command(cmd)
         else:
             cmd_string = ' '.join(cmd)
 
         log(f'{self.name}: {cmd_string}')
-        result = self.ssh.run(cmd_string, env=env, stdin=stdin, stdout=stdout, stderr=stderr, timeout=timeout)
+        captured: bytes | None = None
+        if return_stdout:
+            result, captured = self._run_capture(cmd_string, env=env, stdin=stdin, stderr=stderr, timeout=timeout)
+        else:
+            with self.sessions:
+                result = self.ssh.run(cmd_string, env=env, stdin=stdin, stdout=stdout, stderr=stderr,
+                        timeout=timeout)
         if result != 0:
             if catch:
                 log(f'error: \'{cmd_string}\' failed ({result})')
             else:
                 raise CalledProcessError(result, cmd_string)
 
-        if stdout_capture:
-            return stdout_capture.getvalue().strip()
+        if captured is not None:
+            return captured.decode('utf-8').strip()
+
+    def _run_capture(self, cmd_string: str, *,
+            env: Mapping[str, str],
+            stdin: TextIO | bool,
+            stderr: TextIO,
+            timeout: int | None) -> tuple[int, bytes]:
+        """
+        Like SSH.run, but collect stdout as raw bytes instead of decoding and
+        writing it chunk by chunk.
+
+        :returns: the exit code of the command and its stdout
+        """
+        input = None if isinstance(stdin, bool) else stdin.read().encode('utf-8')
+
+        with self.sessions:
+            p = self.ssh.Popen(cmd_string, env)
+            try:
+                out, err = p.communicate(input, timeout=self.ssh.timeout if timeout is None else timeout)
+            except subprocess.TimeoutExpired:
+                p.kill()
+                p.wait()
+                raise TimeoutException()
+        stderr.write(err.decode('utf-8'))
+        return p.returncode, out
+
+    def run_script(self, commands: Iterable[str], files: Mapping[str, str] = {}, **kwargs) -> str | None:
+        """
+        Run shell commands via a single SSH invocation on the target node.
+
+        The commands are joined into one script which aborts on the first
+        failing command.
 
-    def write_file(self, path: str, content: str) -> None:
-        self.run(['sh', '-c', f'cat > "{path}"'], stdin=StringIO(content))
+        :param commands: the commands, already quoted for the shell (see shell_command)
+        :param files: files to write before the commands run, the content by path. The content is
+            passed on stdin, so it does not end up in the script (and the log)
+        :param kwargs: passed on to run()
+        :returns: nothing, or a string if return_stdout is True
+        :raise CalledProcessError: when a command fails (unless catch is True)
+        """
+        script = [write_file_command(path, content) for path, content in files.items()]
+        script.extend(commands)
+        if files:
+            kwargs['stdin'] = StringIO(''.join(files.values()))
+        return self.run(['sh', '-ec', '\n'.join(script)], **kwargs)
+
+    @contextlib.contextmanager
+    def wait_for(self, condition: Iterable[str], timeout: float = 10.0) -> Iterator[subprocess.Popen]:
+        """
+        Wait on the node itself until a command succeeds, so that checking it
+        does not cost an SSH round trip each time.
 
+        The command is retried as long as it exits with 1 (like grep without a
+        match), any other failure ends the wait with that exit code. On leaving
+        the context a wait that is still running is dropped.
 
+        :param condition: the command to check, every 100ms
+        :param timeout: give up after that many seconds
+        :returns: the process, which exits with 0 once the condition holds and with 124 on timeout
+        """
+        loop = f'while :; do {shell_command(condition)}; rc=$?; [ $rc -eq 1 ] || exit $rc; sleep 0.1; done'
+        cmd_string = shell_command(['timeout', str(timeout), 'sh', '-c', loop])
+        log(f'{self.name}: {cmd_string}')
+        with self.sessions:
+            p = self.ssh.Popen(cmd_string)
+            try:
+                p.stdin.close()
+                yield p
+            finally:
+                if p.poll() is None:
+                    p.terminate()
+                p.wait()
+
+    def write_files(self, files: Mapping[str, str]) -> None:
+        """
+        Write multiple files via a single SSH invocation.
+
+        :param files: the content of the files, by path
+        """
+        self.run_script([], files=files)
+
+
+def shell_command(cmd: Iterable[str]) -> str:
+    return ' '.join(shlex.quote(str(x)) for x in cmd)
+
+
+def write_file_command(path: str, content: str) -> str:
+    """
+    Command that writes the content, read from stdin, to the file. Only the
+    length and the hash of the content are part of the command.
+    """
+    data = content.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    # files that already have the content (e.g., when rerunning a test on the same nodes) are left alone
+    unchanged = f'echo {shlex.quote(f"{digest}  {path}")} | sha256sum --check --status 2>/dev/null'
+    # head -c reads exactly that many bytes, the content of the next file follows right after it
+    read = f'head -c {len(data)}'
+    return f'if {unchanged}; then {read} >/dev/null; else {read} > {shlex.quote(path)}; fi'
+
+
+@functools.cache
 def volume_name(resource_name: str, volume_number: int) -> str:
     return f'{resource_name}_{volume_number:03}'
 
 
+@functools.cache
 def volume_path(resource_name: str, volume_number: int) -> str:
     return f'/dev/{lvm_volume_group}/{volume_name(resource_name, volume_number)}'
 
 
-def create_storage_volume(node, volume: DRBDVolume) -> None:
-    node.run(['lvcreate', '--wipesignatures', 'y', '--yes',
+def create_storage_volume_cmd(volume: DRBDVolume) -> list[str]:
+    return ['lvcreate', '--wipesignatures', 'y', '--yes',
         '--name', volume.storage_name,
         '--size', volume.size,
-        lvm_volume_group])
+        lvm_volume_group]
 
 
+@functools.cache
 def drbd_config_file_path(resource_name: str) -> str:
     return f'/etc/drbd.d/{resource_name}.res'
 
@@ -137,42 +284,47 @@ def add_drbd_volume(resource: DRBDResource, size: str = '20M', minor_number: int
 def deploy_drbd(resource: DRBDResource, nodes: Sequence[Node]) -> None:
     config_str = drbd_config(resource)
 
-    for node in nodes:
-        for volume in resource.volumes:
-            create_storage_volume(node, volume)
-        node.write_file(drbd_config_file_path(resource.name), config_str)
-        node.run(['drbdadm', 'create-md', '--force', resource.name])
-        node.run(['drbdadm', 'adjust', resource.name])
+    # the same steps on every node, as one script to only pay for one SSH round trip per node
+    script = [shell_command(create_storage_volume_cmd(volume)) for volume in resource.volumes]
+    script.append(shell_command(['drbdadm', 'create-md', '--force', resource.name]))
+    script.append(shell_command(['drbdadm', 'adjust', resource.name]))
+    files = {drbd_config_file_path(resource.name): config_str}
+
+    on_nodes(lambda node: node.run_script(script, files=files), nodes)
 
-    for volume in resource.volumes:
-        nodes[0].run(['drbdadm', 'new-current-uuid', '--clear-bitmap', f'{resource.name}/{volume.volume_number}'])
+    new_current_uuid = [
+        shell_command(['drbdadm', 'new-current-uuid', '--clear-bitmap', f'{resource.name}/{volume.volume_number}'])
+        for volume in resource.volumes]
+    if new_current_uuid:
+        nodes[0].run_script(new_current_uuid)
 
 
+@functools.cache
 def reactor_config_file_path(filename: str) -> str:
     return f'/etc/drbd-reactor.d/{filename}'
 
 
-def restart_reactor(node: Node) -> None:
-    node.run(['systemctl', 'restart', 'drbd-reactor'])
+def restart_reactor_cmd() -> list[str]:
+    return ['systemctl', 'restart', 'drbd-reactor']
 
 
 def deploy_reactor(config: ReactorConfig, filename: str, nodes: Iterable[Node]) -> None:
     config_str = dump_reactor_config(config)
-    for node in nodes:
-        node.write_file(reactor_config_file_path(filename), config_str)
-        restart_reactor(node)
+    files = {reactor_config_file_path(filename): config_str}
+    on_nodes(lambda node: node.run_script([shell_command(restart_reactor_cmd())], files=files), nodes)
 
 
 def install_dummy_service(node: Node) -> None:
-    node.write_file(dummy_service.dummy_service_status_path, '')
-    node.write_file(dummy_service.dummy_service_script_path, dummy_service.dummy_service_script)
-    node.write_file(dummy_service.dummy_service_path, dummy_service.dummy_service_template)
+    node.write_files({
+        dummy_service.dummy_service_status_path: '',
+        dummy_service.dummy_service_script_path: dummy_service.dummy_service_script,
+        dummy_service.dummy_service_path: dummy_service.dummy_service_template,
+    })
 
 
-def dummy_service_started(node: Node, device: str) -> bool:
-    status = node.run(['cat', dummy_service.dummy_service_status_path],
-            return_stdout=True)
-    return device in cast(str, status).splitlines()
+def dummy_service_started_cmd(device: str) -> list[str]:
+    # matches on the node, only the exit status has to come back and not the whole status file
+    return ['grep', '--quiet', '--line-regexp', '--fixed-strings', device, dummy_service.dummy_service_status_path]
 
 
 def prometheus_endpoint_scrape(node: Node, prometheus_address) -> str:
@@ -181,29 +333,112 @@ def prometheus_endpoint_scrape(node: Node, prometheus_address) -> str:
     return cast(str, prometheus_output)
 
 
+def backoff_intervals(first: float = 0.05, factor: float = 1.5, maximum: float = 1.0) -> Iterator[float]:
+    interval = first
+    while True:
+        yield interval
+        interval = min(interval * factor, maximum)
+
+
 def poll_nodes(nodes: Sequence[Node],
         condition: Callable[[Node], bool],
         description: str,
-        expected_node: Node | None = None):
-    for _ in range(20):
-        matched_nodes = []
-        for node in nodes:
-            if condition(node):
+        expected_node: Node | None = None,
+        timeout: float | None = 10.0,
+        intervals: Iterable[float] | None = None):
+    """
+    Poll the nodes until the condition holds on exactly one of them.
+
+    By default polls are placed densely at first, where most events are
+    expected to happen, and then back off geometrically until the timeout is
+    reached.
+
+    :param timeout: give up after that many seconds, None to only stop when the intervals run out
+    :param intervals: the pauses between the polls in seconds, instead of the default backoff
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pauses = iter(backoff_intervals() if intervals is None else intervals)
+    # probe all nodes at once, a round then takes as long as the slowest node and not the sum of all
+    executor = ThreadPoolExecutor(max_workers=max(len(nodes), 1))
+    try:
+        while True:
+            probes = {executor.submit(condition, node): node for node in nodes}
+            matched_nodes = []
+            for probe in as_completed(probes):
+                if not probe.result():
+                    continue
+                node = probes[probe]
                 matched_nodes.append(node)
-
-        match matched_nodes:
-            case []:
-                time.sleep(0.5)
-            case [node]:
-                if expected_node is None:
-                    log(f'{description} on node: {node}')
+                # this can not end well anymore, no need to wait for the slower nodes
+                if len(matched_nodes) > 1 or (expected_node is not None and node != expected_node):
                     break
-                elif node == expected_node:
-                    log(f'{description} on expected node: {node}')
-                    break
-                else:
-                    raise AssertionError(f'{description} on unexpected node: {node}')
-            case _:
-                raise AssertionError(f'{description} on multiple nodes')
-    else:
+
+            if matched_nodes:
+                check_single_match(matched_nodes, description, expected_node)
+                break
+
+            pause = next(pauses, None)
+            if deadline is not None and pause is not None:
+                pause = min(pause, deadline - time.monotonic())
+            if pause is None or pause <= 0:
+                raise AssertionError(f'"{description}" did not occur on any node')
+            time.sleep(pause)
+    finally:
+        # only probes that are still running when we fail early are left
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def wait_nodes(nodes: Sequence[Node],
+        condition: Iterable[str],
+        description: str,
+        expected_node: Node | None = None,
+        timeout: float = 10.0,
+        grace: float = 0.5):
+    """
+    Like poll_nodes, but the condition is a command that is checked on the
+    nodes themselves (see Node.wait_for), so there is only one SSH
+    invocation per node instead of one per node and poll.
+
+    Once the condition holds on a node, the other nodes are still waited on
+    for the grace period, so that a match on multiple nodes is detected
+    even if one of them was a little faster.
+
+    :param grace: keep waiting on the other nodes for that many seconds after the first match
+    """
+    condition = list(condition)
+    # the remote side gives up after the timeout, an SSH session that stalls must not keep us forever
+    deadline = time.monotonic() + timeout + max((node.ssh.timeout or 0 for node in nodes), default=0)
+    with contextlib.ExitStack() as stack:
+        waits = {node: stack.enter_context(node.wait_for(condition, timeout)) for node in nodes}
+        while True:
+            finished = {node: p.returncode for node, p in waits.items() if p.poll() is not None}
+            for node, returncode in finished.items():
+                if returncode not in (0, 124):
+                    raise CalledProcessError(returncode, shell_command(condition))
+
+            matched_nodes = [node for node, returncode in finished.items() if returncode == 0]
+            if matched_nodes:
+                deadline = min(deadline, time.monotonic() + grace)
+            if len(finished) == len(waits) or (matched_nodes and time.monotonic() >= deadline):
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutException()
+            # only local process state, no round trip
+            time.sleep(0.05)
+
+    if not matched_nodes:
         raise AssertionError(f'"{description}" did not occur on any node')
+    check_single_match(matched_nodes, description, expected_node)
+
+
+def check_single_match(matched_nodes: Sequence[Node], description: str, expected_node: Node | None) -> None:
+    match matched_nodes:
+        case [node]:
+            if expected_node is None:
+                log(f'{description} on node: {node}')
+            elif node == expected_node:
+                log(f'{description} on expected node: {node}')
+            else:
+                raise AssertionError(f'{description} on unexpected node: {node}')
+        case _:
+            raise AssertionError(f'{description} on multiple nodes')
@@ -0,0 +1,19 @@
+from collections import OrderedDict, UserList
+
+from common.reactor_config import Promoter, PromoterResource, ReactorConfig, dump_reactor_config, to_plain
+
+
+def test_to_plain_mapping_subclass() -> None:
+    assert to_plain(OrderedDict(a_b=1, c=None)) == {'a-b': 1}
+
+
+def test_to_plain_sequence_subclass() -> None:
+    assert to_plain(UserList([OrderedDict(a_b=1)])) == [{'a-b': 1}]
+
+
+def test_dump_reactor_config_mapping_subclass() -> None:
+    config = ReactorConfig(promoter=[Promoter(
+        resources=OrderedDict(res=PromoterResource(start=['a.service'], preferred_nodes=['n1'])))])
+    assert dump_reactor_config(config) == dump_reactor_config(ReactorConfig(promoter=[Promoter(
+        resources={'res': PromoterResource(start=['a.service'], preferred_nodes=['n1'])})]))
+    assert 'preferred-nodes' in dump_reactor_config(config)
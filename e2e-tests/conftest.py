@@ -0,0 +1,2 @@
+# pytest puts the directory of this file on sys.path, so that the unit tests of the helpers can import
+# them as 'common.*' like the tests do, also when pytest runs from the top of the repository
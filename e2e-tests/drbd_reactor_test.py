@@ -19,7 +19,10 @@ def main() -> None:
     mod = importlib.import_module(f'tests.{args.test}')
 
     cluster = reactortest.Cluster(args.host)
-    mod.test(cluster)
+    try:
+        mod.test(cluster)
+    finally:
+        cluster.close()
 
 
 def notempty(arg: str) -> str:
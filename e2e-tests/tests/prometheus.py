@@ -9,6 +9,9 @@ prometheus_address = "0.0.0.0:9952"
 # match 'drbdreactor_up 1' exactly from prometheus output
 prometheus_pattern = re.compile(r'drbdreactor_up\s1')
 
+# pauses between scrapes in seconds: retry quickly while the endpoint is still being bound, then back off
+scrape_intervals = [0.001, 0.003, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 3.033, 5.0]
+
 
 def verify_prometheus_endpoint(node: reactortest.Node) -> bool:
     prometheus_output = reactortest.prometheus_endpoint_scrape(node, prometheus_address)
@@ -31,4 +34,6 @@ def test(cluster: reactortest.Cluster) -> None:
 
     reactortest.poll_nodes(nodes=cluster.nodes,
             condition=verify_prometheus_endpoint,
-            description='match found')
+            description='match found',
+            timeout=None,
+            intervals=scrape_intervals)
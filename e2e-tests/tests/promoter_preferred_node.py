@@ -14,8 +14,7 @@ def test(cluster: reactortest.Cluster) -> None:
     device = drbd_config.drbd_device(res.volumes[0].minor_number)
 
     # Let DRBD connect before deploying Reactor
-    for node in cluster.nodes:
-        node.run(['drbdadm', 'wait-connect', 'res'])
+    reactortest.on_nodes(lambda node: node.run(['drbdadm', 'wait-connect', 'res']), cluster.nodes)
 
     preferred_node = cluster.nodes[-1]
 
@@ -29,7 +28,7 @@ def test(cluster: reactortest.Cluster) -> None:
                         )})])
     reactortest.deploy_reactor(config, 'drbd-res.toml', cluster.nodes)
 
-    reactortest.poll_nodes(nodes=cluster.nodes,
-            condition=lambda node: reactortest.dummy_service_started(node, device),
+    reactortest.wait_nodes(nodes=cluster.nodes,
+            condition=reactortest.dummy_service_started_cmd(device),
             description='service started',
             expected_node=preferred_node)
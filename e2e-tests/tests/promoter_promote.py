@@ -22,6 +22,6 @@ def test(cluster: reactortest.Cluster) -> None:
                         )})])
     reactortest.deploy_reactor(config, 'drbd-res.toml', cluster.nodes)
 
-    reactortest.poll_nodes(nodes=cluster.nodes,
-            condition=lambda node: reactortest.dummy_service_started(node, device),
+    reactortest.wait_nodes(nodes=cluster.nodes,
+            condition=reactortest.dummy_service_started_cmd(device),
             description='service started')
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from common import drbd_config
 from common import dummy_service
 from common import reactortest
@@ -23,13 +25,15 @@ def test(cluster: reactortest.Cluster) -> None:
                             role=WithOperator(operator='NotEquals', value='Primary')),
                         new=UMHResourceUpdateState(role='Primary')
                         )])])
-    reactortest.deploy_reactor(config, 'umh.toml', cluster.nodes)
-
     primary_node = cluster.nodes[0]
-    primary_node.run(['drbdadm', 'wait-connect', 'res'])
+    # DRBD can connect while Reactor gets deployed, only the promotion has to wait for both
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        connected = executor.submit(primary_node.run, ['drbdadm', 'wait-connect', 'res'])
+        reactortest.deploy_reactor(config, 'umh.toml', cluster.nodes)
+        connected.result()
     primary_node.run(['drbdadm', 'primary', 'res'])
 
-    reactortest.poll_nodes(nodes=cluster.nodes,
-            condition=lambda node: reactortest.dummy_service_started(node, device),
+    reactortest.wait_nodes(nodes=cluster.nodes,
+            condition=reactortest.dummy_service_started_cmd(device),
             description='command ran',
             expected_node=primary_node)
@@ -1,6 +1,6 @@
 use std::collections::HashMap;
 use std::env;
-use std::fmt;
+use std::fmt::{self, Write as _};
 use std::fs;
 use std::io::{self, Write};
 use std::io::{BufRead, BufReader};
@@ -10,8 +10,9 @@ use std::path::{Path, PathBuf};
 use std::process::{Command, Output, Stdio};
 use std::str::FromStr;
 use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Mutex, OnceLock};
 use std::thread;
-use std::time::Duration;
+use std::time::{Duration, Instant};
 
 use anyhow::{Context, Result};
 use clap::{crate_authors, crate_version, App, AppSettings, Arg, ArgMatches, Shell, SubCommand};
@@ -33,6 +34,8 @@ static TERMINATE: AtomicBool = AtomicBool::new(false);
 
 const REACTOR_RELOAD_PATH: &str = "drbd-reactor-reload.path";
 const REACTOR_SERVICE: &str = "drbd-reactor.service";
+// upper bound for the number of snippets whose status is gathered in parallel
+const STATUS_WORKERS: usize = 32;
 
 struct ClusterConf<'a> {
     context: &'a str,
@@ -64,8 +67,9 @@ fn main() -> Result<()> {
     let config_file = matches
         .value_of("config")
         .expect("expected to have a default");
-    let snippets_path = get_snippets_path(&PathBuf::from(config_file))
-        .with_context(|| "Could not get snippets path from config file")?;
+    // the main config is only read if the snippets path is actually needed (i.e., not for absolute
+    // paths)
+    let config_file = PathBuf::from(config_file);
 
     let context = matches
         .value_of("context")
@@ -86,20 +90,19 @@ fn main() -> Result<()> {
     };
 
     match matches.subcommand() {
-        ("cat", Some(cat_matches)) => cat(
-            expand_snippets(&snippets_path, cat_matches, false),
-            &cluster,
-        ),
+        ("cat", Some(cat_matches)) => {
+            cat(expand_snippets(&config_file, cat_matches, false)?, &cluster)
+        }
         ("disable", Some(disable_matches)) => {
             let now = disable_matches.is_present("now");
             disable(
-                expand_snippets(&snippets_path, disable_matches, false),
+                expand_snippets(&config_file, disable_matches, false)?,
                 now,
                 &cluster,
             )
         }
         ("enable", Some(enable_matches)) => enable(
-            expand_snippets(&snippets_path, enable_matches, true),
+            expand_snippets(&config_file, enable_matches, true)?,
             &cluster,
         ),
         ("edit", Some(edit_matches)) => {
@@ -109,8 +112,7 @@ fn main() -> Result<()> {
                 .value_of("type")
                 .expect("expected to have a default");
             edit(
-                expand_snippets(&snippets_path, edit_matches, disabled),
-                &snippets_path,
+                expand_snippets(&config_file, edit_matches, disabled)?,
                 type_opt,
                 force,
                 &cluster,
@@ -125,7 +127,7 @@ fn main() -> Result<()> {
                 .expect("expected to have a default");
             let delay = delay.parse().expect("expected to be checked by parser");
             evict(
-                expand_snippets(&snippets_path, evict_matches, false),
+                expand_snippets(&config_file, evict_matches, false)?,
                 force,
                 keep_masked,
                 unmask,
@@ -135,7 +137,7 @@ fn main() -> Result<()> {
         ("ls", Some(ls_matches)) => {
             let disabled = ls_matches.is_present("disabled");
             ls(
-                expand_snippets(&snippets_path, ls_matches, disabled),
+                expand_snippets(&config_file, ls_matches, disabled)?,
                 &cluster,
             )
         }
@@ -143,7 +145,7 @@ fn main() -> Result<()> {
             let with_targets = restart_matches.is_present("with_targets");
             let configs = match restart_matches.values_of("configs") {
                 None => Vec::new(),
-                Some(_) => expand_snippets(&snippets_path, restart_matches, false),
+                Some(_) => expand_snippets(&config_file, restart_matches, false)?,
             };
             restart(configs, with_targets, &cluster)
         }
@@ -151,7 +153,7 @@ fn main() -> Result<()> {
             let force = rm_matches.is_present("force");
             let disabled = rm_matches.is_present("disabled");
             rm(
-                expand_snippets(&snippets_path, rm_matches, disabled),
+                expand_snippets(&config_file, rm_matches, disabled)?,
                 force,
                 &cluster,
             )
@@ -160,14 +162,14 @@ fn main() -> Result<()> {
             let until = until_matches
                 .value_of("until")
                 .expect("expected to be checked by parser");
-            start_until(expand_snippets(&snippets_path, until_matches, true), until)
+            start_until(expand_snippets(&config_file, until_matches, true)?, until)
         }
         ("status", Some(status_matches)) => {
             let verbose = status_matches.is_present("verbose");
             let resources = status_matches.values_of("resource").unwrap_or_default();
             let resources: Vec<String> = resources.map(String::from).collect::<Vec<_>>();
             status(
-                expand_snippets(&snippets_path, status_matches, false),
+                expand_snippets(&config_file, status_matches, false)?,
                 verbose,
                 &resources,
                 &cluster,
@@ -177,7 +179,7 @@ fn main() -> Result<()> {
             // pretend it is status
             let args: ArgMatches = Default::default();
             status(
-                expand_snippets(&snippets_path, &args, false),
+                expand_snippets(&config_file, &args, false)?,
                 false,
                 &vec![],
                 &cluster,
@@ -213,11 +215,16 @@ fn ask(question: &str, default: bool) -> Result<bool> {
     }
 }
 
-fn edit_editor(tmppath: &Path, editor: &str, type_opt: &str, force: bool) -> Result<()> {
+fn edit_editor(tmppath: &Path, editor: &[String], type_opt: &str, force: bool) -> Result<()> {
     let len_err =
         || -> Result<()> { Err(anyhow::anyhow!("Expected excactly one {} plugin", type_opt)) };
 
-    plugin::map_status(Command::new(editor).arg(tmppath).status())?;
+    plugin::map_status(
+        Command::new(&editor[0])
+            .args(&editor[1..])
+            .arg(tmppath)
+            .status(),
+    )?;
 
     let content = fs::read_to_string(tmppath)?;
     let config: config::Config = toml::from_str(&content)?;
@@ -227,43 +234,33 @@ fn edit_editor(tmppath: &Path, editor: &str, type_opt: &str, force: bool) -> Res
         return Err(anyhow::anyhow!("Expected exactly 1 plugin configuration"));
     }
 
-    if type_opt == "promoter" {
-        if plugins.promoter.len() != 1 {
-            return len_err();
-        }
-        for promoter in plugins.promoter {
-            for config in promoter.resources.values() {
-                if let Some(last) = config.start.last() {
-                    if last.ends_with(".mount") {
-                        let err = "Mount unit should not be the topmost unit, consider using an \
-                                   OCF file system RA";
-                        if force {
-                            warn(err);
-                        } else {
-                            return Err(anyhow::anyhow!(err));
-                        }
+    let nr_of_type = match type_opt {
+        "promoter" => plugins.promoter.len(),
+        "prometheus" => plugins.prometheus.len(),
+        "agentx" => plugins.agentx.len(),
+        "umh" => plugins.umh.len(),
+        "debugger" => plugins.debugger.len(),
+        x => return Err(anyhow::anyhow!("Unknown type ('{}') to edit", x)),
+    };
+    if nr_of_type != 1 {
+        return len_err();
+    }
+
+    // exactly one plugin in total and one of type_opt, so this is only non-empty for promoters
+    for promoter in plugins.promoter {
+        for config in promoter.resources.values() {
+            if let Some(last) = config.start.last() {
+                if last.ends_with(".mount") {
+                    let err = "Mount unit should not be the topmost unit, consider using an OCF \
+                               file system RA";
+                    if force {
+                        warn(err);
+                    } else {
+                        return Err(anyhow::anyhow!(err));
                     }
                 }
             }
         }
-    } else if type_opt == "prometheus" {
-        if plugins.prometheus.len() != 1 {
-            return len_err();
-        }
-    } else if type_opt == "agentx" {
-        if plugins.agentx.len() != 1 {
-            return len_err();
-        }
-    } else if type_opt == "umh" {
-        if plugins.umh.len() != 1 {
-            return len_err();
-        }
-    } else if type_opt == "debugger" {
-        if plugins.debugger.len() != 1 {
-            return len_err();
-        }
-    } else {
-        return Err(anyhow::anyhow!("Unknown type ('{}') to edit", type_opt));
     }
 
     Ok(())
@@ -308,7 +305,6 @@ fn rm_header(tmppath: &Path) -> Result<()> {
 
 fn edit(
     snippets_paths: Vec<PathBuf>,
-    snippets_path: &PathBuf,
     type_opt: &str,
     force: bool,
     cluster: &ClusterConf,
@@ -318,17 +314,27 @@ fn edit(
     }
 
     let editor = env::var("EDITOR").unwrap_or("vi".to_string());
+    // allow things like EDITOR="vim -u NONE", executed directly without an intermediate shell
+    let editor = shell_words::split(&editor)
+        .with_context(|| format!("Could not parse EDITOR '{}'", editor))?;
+    if editor.is_empty() {
+        return Err(anyhow::anyhow!("EDITOR is set, but empty"));
+    }
 
     let mut persisted = 0;
     for snippet in &snippets_paths {
-        // use new_in() to avoid $TMPDIR being on a different mount point than snippets_path
+        // use new_in() to avoid $TMPDIR being on a different mount point than the snippet
         // as this would result in an error on .persist()
         // also we can avoid using special methods and can just use the path as there won't be any TMPDIR cleaners
-        let mut tmpfile = NamedTempFile::new_in(snippets_path)?;
+        let snippet_dir = snippet.parent().unwrap_or_else(|| Path::new("."));
+        let mut tmpfile = NamedTempFile::new_in(snippet_dir)?;
         let mut from_template = false;
-        if snippet.exists() {
-            fs::copy(snippet, tmpfile.path())?;
-        } else {
+        let copied = match fs::copy(snippet, tmpfile.path()) {
+            Ok(_) => true,
+            Err(e) if e.kind() == ErrorKind::NotFound => false,
+            Err(e) => return Err(e.into()),
+        };
+        if !copied {
             let template = match type_opt {
                 "promoter" => PROMOTER_TEMPLATE,
                 "prometheus" => PROMETHEUS_TEMPLATE,
@@ -468,46 +474,63 @@ fn enable(snippets_paths: Vec<PathBuf>, cluster: &ClusterConf) -> Result<()> {
         return Ok(());
     }
 
+    enable_snippets(&snippets_paths, has_autoload()?)
+}
+
+fn enable_snippets(snippets_paths: &[PathBuf], autoload: bool) -> Result<()> {
     let mut enabled = 0;
-    for snippet in &snippets_paths {
-        if !snippet.exists() {
-            warn(&format!(
-                "'{}' does not exist, doing nothing",
-                snippet.display()
-            ));
-            continue;
+    for snippet in snippets_paths {
+        // the warning for a missing snippet comes first, before its path is checked for the suffix
+        match fs::symlink_metadata(snippet) {
+            Ok(_) => (),
+            Err(e) if e.kind() == ErrorKind::NotFound => {
+                warn(&format!(
+                    "'{}' does not exist, doing nothing",
+                    snippet.display()
+                ));
+                continue;
+            }
+            Err(e) => return Err(e.into()),
         }
         eprintln!("Enabling '{}'...", snippet.display());
         let enabled_path = get_enabled_path(snippet)?;
-        if enabled_path.exists() {
-            warn(&format!(
-                "'{}' already exists, doing nothing",
-                enabled_path.display()
-            ));
-            continue;
+        // rename() would silently replace an existing snippet, link() fails on it instead
+        match fs::hard_link(snippet, &enabled_path) {
+            Ok(()) => fs::remove_file(snippet)?,
+            Err(e) if e.kind() == ErrorKind::AlreadyExists => {
+                warn(&format!(
+                    "'{}' already exists, doing nothing",
+                    enabled_path.display()
+                ));
+                continue;
+            }
+            Err(e) => return Err(e.into()),
         }
-        fs::rename(snippet, enabled_path)?;
         enabled += 1;
     }
 
-    if enabled > 0 && !has_autoload()? {
+    if enabled > 0 && !autoload {
         reload_service()?;
     }
 
     Ok(())
 }
 
-fn stop_targets(snippets_paths: Vec<PathBuf>) -> Result<()> {
-    for snippet in &snippets_paths {
+fn stop_targets(snippets_paths: &[PathBuf]) -> Result<()> {
+    // collect all the targets and stop them with a single systemctl call
+    let mut args = vec!["stop".to_string()];
+    for snippet in snippets_paths {
         let conf = read_config(snippet)?;
         for promoter in conf.plugins.promoter {
             for drbd_res in promoter.resources.keys() {
-                let target = systemd::escaped_services_target(drbd_res);
-                systemctl(vec!["stop".into(), target])?;
+                args.push(systemd::escaped_services_target(drbd_res));
             }
         }
     }
 
+    if args.len() > 1 {
+        systemctl(args)?;
+    }
     Ok(())
 }
 
@@ -516,30 +539,50 @@ fn disable(snippets_paths: Vec<PathBuf>, with_targets: bool, cluster: &ClusterCo
         return Ok(());
     }
 
+    disable_snippets(&snippets_paths, with_targets, has_autoload()?)?;
+    Ok(())
+}
+
+// returns the paths of the snippets that actually got disabled
+fn disable_snippets(
+    snippets_paths: &[PathBuf],
+    with_targets: bool,
+    autoload: bool,
+) -> Result<Vec<PathBuf>> {
     let mut disabled_snippets_paths: Vec<PathBuf> = Vec::new();
-    for snippet in &snippets_paths {
-        if !snippet.exists() {
-            warn(&format!(
-                "'{}' does not exist, doing nothing",
-                snippet.display()
-            ));
-            continue;
-        }
+    for snippet in snippets_paths {
         eprintln!("Disabling '{}'...", snippet.display());
         let disabled_path = get_disabled_path(snippet);
-        fs::rename(snippet, disabled_path.clone())?;
+        if !rename_snippet(snippet, &disabled_path)? {
+            continue;
+        }
         disabled_snippets_paths.push(disabled_path);
     }
     // we have to keep this order
     // reload first, so that a stop does not trigger a start again
-    if !disabled_snippets_paths.is_empty() && !has_autoload()? {
+    if !disabled_snippets_paths.is_empty() && !autoload {
         reload_service()?;
     }
     if with_targets {
-        stop_targets(disabled_snippets_paths)?;
+        stop_targets(&disabled_snippets_paths)?;
     }
 
-    Ok(())
+    Ok(disabled_snippets_paths)
+}
+
+// renames directly instead of checking for existence first, returns false if there was no such snippet
+fn rename_snippet(from: &Path, to: &Path) -> Result<bool> {
+    match fs::rename(from, to) {
+        Ok(()) => Ok(true),
+        Err(e) if e.kind() == ErrorKind::NotFound => {
+            warn(&format!(
+                "'{}' does not exist, doing nothing",
+                from.display()
+            ));
+            Ok(false)
+        }
+        Err(e) => Err(e.into()),
+    }
 }
 
 fn get_disabled_path(snippet_path: &Path) -> PathBuf {
@@ -583,87 +626,176 @@ fn status(
         return Ok(());
     }
 
-    for snippet in snippets_paths {
-        println!("{}:", snippet.display());
-        let conf = read_config(&snippet)?;
-        let plugins = conf.plugins;
-        let me = promoter::uname_n()?;
-        for promoter in plugins.promoter {
-            for (drbd_res, config) in promoter.resources {
-                // check if in filter
-                if !resources.is_empty() && !resources.contains(&drbd_res) {
-                    continue;
-                }
-                let target = systemd::escaped_services_target(&drbd_res);
-                let primary = get_primary(&drbd_res).unwrap_or(UNKNOWN.to_string());
-                let primary = if primary == me {
-                    "this node".to_string()
-                } else {
-                    format!("node '{}'", primary)
-                };
-                println!("Promoter: Currently active on {}", primary);
-                // target itself and the implicit one
-                let promote_service = promote_service(&drbd_res);
-                if verbose {
-                    // systemctl status in this case returns != 0 if service not started
-                    // but we expect that on n-1 nodes and we don't want to fail in this case
-                    let _ = systemctl(vec!["status".into(), "--no-pager".into(), target]);
-                    let _ = systemctl(vec!["status".into(), "--no-pager".into(), promote_service]);
-                } else {
-                    println!("{} {}", status_dot(&target)?, target);
-                    println!("{} ├─ {}", status_dot(&promote_service)?, promote_service);
-                }
-                for (i, start) in config.start.iter().enumerate() {
-                    let service_name = service_name(start, &drbd_res)?;
-                    if verbose {
-                        // systemctl status in this case returns != 0 if service not started
-                        // but we expect that on n-1 nodes and we don't want to fail in this case
-                        let _ = systemctl(vec!["status".into(), "--no-pager".into(), service_name]);
-                    } else {
-                        let sep = if i == config.start.len() - 1 {
-                            "└─"
-                        } else {
-                            "├─"
+    // parse the snippets up front: the local node name and the primaries are only needed if there
+    // is a promoter, and then drbdsetup is queried once for all resources of all snippets. if either
+    // fails, the primaries are unknown
+    let confs: Vec<_> = snippets_paths.iter().map(|p| read_config(p)).collect();
+    let has_promoter = confs
+        .iter()
+        .flatten()
+        .any(|conf| !conf.plugins.promoter.is_empty());
+    let me = match has_promoter {
+        true => promoter::uname_n().ok(),
+        false => None,
+    };
+    let primaries = match &me {
+        Some(me) => get_primaries(me).unwrap_or_default(),
+        None => HashMap::new(),
+    };
+
+    // gathering the status is mostly waiting for systemctl/TCP connects, this can be done for
+    // several snippets in parallel: a bounded number of workers takes the next snippet until all are
+    // done, the output (stdout and stderr) is buffered per snippet and printed in order
+    let work = Mutex::new(snippets_paths.iter().zip(confs).enumerate());
+    let workers = snippets_paths.len().min(STATUS_WORKERS);
+    let mut results: Vec<(usize, String, String, Result<()>)> = thread::scope(|s| {
+        let threads: Vec<_> = (0..workers)
+            .map(|_| {
+                let (work, me, primaries) = (&work, me.as_deref(), &primaries);
+                s.spawn(move || {
+                    let mut done = Vec::new();
+                    loop {
+                        let next = work.lock().expect("lock should not be poisoned").next();
+                        let (i, (snippet, conf)) = match next {
+                            Some(next) => next,
+                            None => break,
                         };
-                        println!(
-                            "{} {} {} {}",
-                            status_dot(&service_name)?,
-                            sep,
-                            service_name,
-                            freezer_state(&service_name)?
-                        );
+                        let mut out = format!("{}:\n", snippet.display());
+                        let mut err = String::new();
+                        let result = conf.and_then(|conf| {
+                            status_snippet(
+                                &mut out, &mut err, conf, verbose, resources, me, primaries,
+                            )
+                        });
+                        done.push((i, out, err, result));
                     }
-                }
-            }
+                    done
+                })
+            })
+            .collect();
+        threads
+            .into_iter()
+            .flat_map(|t| t.join().expect("thread should not panic"))
+            .collect()
+    });
+    results.sort_by_key(|(i, ..)| *i);
+
+    for (_, out, err, result) in results {
+        print!("{}", out);
+        if !err.is_empty() {
+            io::stdout().flush()?;
+            eprint!("{}", err);
         }
-        for prometheus in plugins.prometheus {
-            println!(
-                "Prometheus: listening on {}",
-                prometheus.address.to_string().bold().green()
-            );
+        result?;
+    }
+    Ok(())
+}
+
+fn status_snippet(
+    out: &mut String,
+    err: &mut String,
+    conf: config::Config,
+    verbose: bool,
+    resources: &Vec<String>,
+    me: Option<&str>,
+    primaries: &HashMap<String, String>,
+) -> Result<()> {
+    let plugins = conf.plugins;
+    for promoter in plugins.promoter {
+        for (drbd_res, config) in promoter.resources {
+            // check if in filter
+            if !resources.is_empty() && !resources.contains(&drbd_res) {
+                continue;
+            }
+            let target = systemd::escaped_services_target(&drbd_res);
+            let primary = primaries.get(&drbd_res).map_or(UNKNOWN, |p| p.as_str());
+            let primary = if me == Some(primary) {
+                "this node".to_string()
+            } else {
+                format!("node '{}'", primary)
+            };
+            writeln!(out, "Promoter: Currently active on {}", primary)?;
+            // target itself, the implicit one, and then the services from the start list
+            let mut units = vec![target, promote_service(&drbd_res)];
+            for start in &config.start {
+                units.push(service_name(start, &drbd_res)?);
+            }
             if verbose {
-                for addr in prometheus.address.to_socket_addrs()? {
-                    let status = match TcpStream::connect_timeout(&addr, Duration::from_secs(2)) {
-                        Ok(_) => format!("{}", "success".bold().green()),
-                        Err(e) => format!("{} ({})", "failed".bold().red(), e),
-                    };
-                    println!("TCP Connect ({}): {}", addr, status);
+                // one systemctl call for all the units of the resource
+                let mut args = vec!["status".into(), "--no-pager".into()];
+                args.extend(units);
+                // systemctl status in this case returns != 0 if service not started
+                // but we expect that on n-1 nodes and we don't want to fail in this case
+                if let Ok(output) = systemctl_output(args) {
+                    out.push_str(&String::from_utf8_lossy(&output.stdout));
+                    err.push_str(&String::from_utf8_lossy(&output.stderr));
                 }
+                continue;
+            }
+
+            // same here, one systemctl call for the states of all the units of the resource
+            let states = systemd::show_properties(&units, &["ActiveState", "FreezerState"])?;
+            writeln!(out, "{} {}", status_dot(&states[0])?, units[0])?;
+            writeln!(out, "{} ├─ {}", status_dot(&states[1])?, units[1])?;
+            let services = units.iter().zip(&states).skip(2);
+            let last = units.len() - 1;
+            for (i, (service_name, state)) in services.enumerate() {
+                let sep = if i + 2 == last { "└─" } else { "├─" };
+                writeln!(
+                    out,
+                    "{} {} {} {}",
+                    status_dot(state)?,
+                    sep,
+                    service_name,
+                    freezer_state(state)?
+                )?;
             }
         }
-        for _ in plugins.debugger {
-            println!("Debugger: {}", "started".bold().green());
-        }
-        for _ in plugins.umh {
-            println!("UMH: {}", "started".bold().green());
-        }
-        for agentx in plugins.agentx {
-            println!(
-                "AgentX: connecting to main agent at {}",
-                agentx.address.bold().green()
-            );
+    }
+    for prometheus in plugins.prometheus {
+        writeln!(
+            out,
+            "Prometheus: listening on {}",
+            prometheus.address.to_string().bold().green()
+        )?;
+        if verbose {
+            // an address might resolve to multiple sockets (e.g., v4 and v6), connect to all of them
+            // at once so that it takes at most one timeout and not one per unreachable socket
+            let addrs: Vec<_> = prometheus.address.to_socket_addrs()?.collect();
+            let connects: Vec<_> = thread::scope(|s| {
+                let threads: Vec<_> = addrs
+                    .iter()
+                    .map(|addr| {
+                        s.spawn(move || TcpStream::connect_timeout(addr, Duration::from_secs(2)))
+                    })
+                    .collect();
+                threads
+                    .into_iter()
+                    .map(|t| t.join().expect("thread should not panic"))
+                    .collect()
+            });
+            for (addr, connect) in addrs.iter().zip(connects) {
+                let status = match connect {
+                    Ok(_) => format!("{}", "success".bold().green()),
+                    Err(e) => format!("{} ({})", "failed".bold().red(), e),
+                };
+                writeln!(out, "TCP Connect ({}): {}", addr, status)?;
+            }
         }
     }
+    for _ in plugins.debugger {
+        writeln!(out, "Debugger: {}", "started".bold().green())?;
+    }
+    for _ in plugins.umh {
+        writeln!(out, "UMH: {}", "started".bold().green())?;
+    }
+    for agentx in plugins.agentx {
+        writeln!(
+            out,
+            "AgentX: connecting to main agent at {}",
+            agentx.address.bold().green()
+        )?;
+    }
     Ok(())
 }
 
@@ -671,6 +803,7 @@ fn cat(snippets_paths: Vec<PathBuf>, cluster: &ClusterConf) -> Result<()> {
     if do_remote(cluster)? {
         return Ok(());
     }
+    let mut catters = vec!["bat", "batcat", "cat"];
     for snippet in snippets_paths {
         if !snippet.exists() {
             warn(&format!(
@@ -680,11 +813,16 @@ fn cat(snippets_paths: Vec<PathBuf>, cluster: &ClusterConf) -> Result<()> {
             continue;
         }
         eprintln!("Displaying {}...", snippet.display());
-        for catter in vec!["bat", "batcat", "cat"] {
-            if plugin::map_status(Command::new(catter).arg(&snippet).status()).is_ok() {
-                break;
+        let mut not_installed = Vec::new();
+        for catter in &catters {
+            match Command::new(catter).arg(&snippet).status() {
+                Ok(status) if status.success() => break,
+                Err(e) if e.kind() == ErrorKind::NotFound => not_installed.push(*catter),
+                _ => (),
             }
         }
+        // no need to search $PATH for them again for the next snippet
+        catters.retain(|c| !not_installed.contains(c));
     }
     Ok(())
 }
@@ -718,44 +856,46 @@ fn evict_unmask_and_start(drbd_resources: &Vec<String>) -> Result<()> {
 }
 
 const UNKNOWN: &str = "<unknown>";
-fn get_primary(drbd_resource: &str) -> Result<String> {
-    let output = Command::new("drbdsetup")
-        .arg("status")
-        .arg("--json")
-        .arg(drbd_resource)
-        .output()?;
-    if !output.status.success() {
-        return Err(anyhow::anyhow!(
-            "'drbdsetup show' not executed successfully"
-        ));
-    }
 
-    #[derive(Deserialize)]
-    #[serde(rename_all = "kebab-case")]
-    struct Resource {
-        role: drbd::Role,
-        connections: Vec<Connection>,
-    }
-    #[derive(Deserialize)]
-    #[serde(rename_all = "kebab-case")]
-    struct Connection {
-        name: String,
-        peer_role: drbd::Role,
+#[derive(Deserialize)]
+#[serde(rename_all = "kebab-case")]
+struct DrbdStatusResource {
+    name: String,
+    role: drbd::Role,
+    connections: Vec<DrbdStatusConnection>,
+}
+#[derive(Deserialize)]
+#[serde(rename_all = "kebab-case")]
+struct DrbdStatusConnection {
+    name: String,
+    peer_role: drbd::Role,
+}
+
+// status of the given resource, or of all resources if None
+fn drbdsetup_status(drbd_resource: Option<&str>) -> Result<Vec<DrbdStatusResource>> {
+    let mut cmd = Command::new("drbdsetup");
+    cmd.arg("status").arg("--json");
+    if let Some(drbd_resource) = drbd_resource {
+        cmd.arg(drbd_resource);
     }
-    let resources: Vec<Resource> = serde_json::from_slice(&output.stdout)?;
-    if resources.len() != 1 {
+    let output = cmd.output()?;
+    if !output.status.success() {
         return Err(anyhow::anyhow!(
-            "resources length from drbdsetup status not exactly 1"
+            "'drbdsetup status' not executed successfully"
         ));
     }
 
+    Ok(serde_json::from_slice(&output.stdout)?)
+}
+
+fn primary_of(resource: &DrbdStatusResource, me: &str) -> Result<String> {
     // is it me?
-    if resources[0].role == drbd::Role::Primary {
-        return promoter::uname_n();
+    if resource.role == drbd::Role::Primary {
+        return Ok(me.to_string());
     }
 
     // a peer?
-    for conn in &resources[0].connections {
+    for conn in &resource.connections {
         if conn.peer_role == drbd::Role::Primary {
             return Ok(conn.name.clone());
         }
@@ -764,9 +904,28 @@ fn get_primary(drbd_resource: &str) -> Result<String> {
     Ok(UNKNOWN.to_string())
 }
 
+fn get_primary(drbd_resource: &str, me: &str) -> Result<String> {
+    let resources = drbdsetup_status(Some(drbd_resource))?;
+    if resources.len() != 1 {
+        return Err(anyhow::anyhow!(
+            "resources length from drbdsetup status not exactly 1"
+        ));
+    }
+
+    primary_of(&resources[0], me)
+}
+
+// maps resource names to their primaries, one drbdsetup call for all resources
+fn get_primaries(me: &str) -> Result<HashMap<String, String>> {
+    drbdsetup_status(None)?
+        .iter()
+        .map(|r| Ok((r.name.clone(), primary_of(r, me)?)))
+        .collect()
+}
+
 fn evict_resource(drbd_resource: &str, delay: u32, me: &str) -> Result<()> {
     println!("Evicting {}", drbd_resource);
-    let mut primary = get_primary(drbd_resource)?;
+    let mut primary = get_primary(drbd_resource, me)?;
     if primary == UNKNOWN {
         println!(
             "Sorry, resource state for '{}' unknown, ignoring",
@@ -787,29 +946,42 @@ fn evict_resource(drbd_resource: &str, delay: u32, me: &str) -> Result<()> {
     systemctl(vec!["daemon-reload".into()])?;
     systemctl_out_err(vec!["stop".into(), target], Stdio::inherit(), Stdio::null())?;
 
+    // poll often in the beginning (a takeover is usually fast), then back off to once a second
+    // the countdown is still printed in seconds, every value from delay down to 0 exactly once
+    let deadline = Instant::now() + Duration::from_secs(delay.into());
+    let mut interval = Duration::from_millis(100);
+    let mut next_secs = Some(u64::from(delay));
     let mut needs_newline = false;
-    for i in (0..=delay).rev() {
-        primary = get_primary(drbd_resource)?;
+    loop {
+        primary = get_primary(drbd_resource, me)?;
         if primary != UNKNOWN && primary != me {
             // a know host/peer
             break;
         }
 
-        let s = if i != 0 {
-            i.to_string() + ".."
-        } else {
-            i.to_string()
-        };
-        print!("{}", s);
-        io::stdout().flush()?;
-        needs_newline = true;
-        if i != 0 {
+        // remaining whole seconds, rounded up
+        let left = deadline.saturating_duration_since(Instant::now());
+        let secs = left.as_secs() + u64::from(left.subsec_nanos() > 0);
+        // catch up on seconds that passed during a slow drbdsetup call instead of skipping them
+        while let Some(n) = next_secs.filter(|&n| n >= secs) {
+            let s = if n != 0 {
+                n.to_string() + ".."
+            } else {
+                n.to_string()
+            };
+            print!("{}", s);
+            io::stdout().flush()?;
+            needs_newline = true;
+            next_secs = n.checked_sub(1);
+        }
+        if left.is_zero() || TERMINATE.load(Ordering::Relaxed) {
             // no need to sleep on last iteration
-            if TERMINATE.load(Ordering::Relaxed) {
-                break;
-            }
-            thread::sleep(Duration::from_secs(1));
+            break;
         }
+        // wake up at the latest when the next value is due
+        let until_next = left - Duration::from_secs(secs - 1);
+        thread::sleep(interval.min(until_next));
+        interval = (interval * 2).min(Duration::from_secs(1));
     }
     if needs_newline {
         println!();
@@ -966,22 +1138,24 @@ fn ls(snippets_paths: Vec<PathBuf>, cluster: &ClusterConf) -> Result<()> {
 
 fn restart(snippets_paths: Vec<PathBuf>, with_targets: bool, cluster: &ClusterConf) -> Result<()> {
     if snippets_paths.is_empty() {
-        systemctl(vec!["restart".into(), REACTOR_SERVICE.into()])
-    } else {
-        disable(snippets_paths.clone(), with_targets, cluster)?;
-        enable(
-            snippets_paths
-                .into_iter()
-                .map(|p| get_disabled_path(&p))
-                .collect(),
-            cluster,
-        )
+        return systemctl(vec!["restart".into(), REACTOR_SERVICE.into()]);
+    }
+
+    // check for remote execution and autoload only once for both steps
+    if do_remote(cluster)? {
+        return Ok(());
     }
+    let autoload = has_autoload()?;
+
+    // only re-enable what got disabled, missing snippets were already reported
+    let disabled_paths = disable_snippets(&snippets_paths, with_targets, autoload)?;
+    enable_snippets(&disabled_paths, autoload)
 }
 
 fn read_config(snippet_path: &Path) -> Result<config::Config> {
-    let content = config::read_snippets(&[snippet_path])
-        .with_context(|| "Could not read config snippets".to_string())?;
+    // a single snippet, no need to concatenate via config::read_snippets()
+    let content = fs::read_to_string(snippet_path)
+        .with_context(|| format!("Could not read config snippet '{}'", snippet_path.display()))?;
     let config = toml::from_str(&content).with_context(|| {
         format!(
             "Could not parse config files including snippets; content: {}",
@@ -995,12 +1169,27 @@ fn read_config(snippet_path: &Path) -> Result<config::Config> {
 fn get_snippets_path(path: &PathBuf) -> Option<PathBuf> {
     let content = fs::read_to_string(path).ok()?;
 
-    toml::from_str::<config::Config>(&content)
+    // we are only interested in the snippets path, no need to deserialize all the (flattened)
+    // plugin and log configs of the main config file
+    #[derive(Deserialize)]
+    struct SnippetsConfig {
+        #[serde(default)]
+        snippets: Option<PathBuf>,
+    }
+    toml::from_str::<SnippetsConfig>(&content)
         .map(|c| c.snippets)
         .ok()?
 }
 
-fn expand_snippets(snippets_path: &PathBuf, matches: &ArgMatches, disabled: bool) -> Vec<PathBuf> {
+fn snippets_path(config_file: &PathBuf) -> Result<PathBuf> {
+    get_snippets_path(config_file).with_context(|| "Could not get snippets path from config file")
+}
+
+fn expand_snippets(
+    config_file: &PathBuf,
+    matches: &ArgMatches,
+    disabled: bool,
+) -> Result<Vec<PathBuf>> {
     let expected_extension = match disabled {
         true => "toml.disabled",
         false => "toml",
@@ -1010,20 +1199,24 @@ fn expand_snippets(snippets_path: &PathBuf, matches: &ArgMatches, disabled: bool
         Some(configs) => configs.map(PathBuf::from).collect::<Vec<_>>(), // process them in the next stage
         None => {
             // "glob expand"
-            match config::files_with_extension_in(snippets_path, expected_extension) {
-                Ok(paths) => return paths,
+            let snippets_path = snippets_path(config_file)?;
+            match config::files_with_extension_in(&snippets_path, expected_extension) {
+                Ok(paths) => return Ok(paths),
                 Err(e) => {
                     eprintln!(
                         "Error reading files in '{}': {}",
                         snippets_path.display(),
                         e
                     );
-                    return Vec::new();
+                    return Ok(Vec::new());
                 }
             }
         }
     };
 
+    let expected_suffix = format!(".{}", expected_extension);
+    // read from the main config on the first relative path, not at all for absolute ones
+    let mut resolved_snippets_path: Option<PathBuf> = None;
     let mut paths = Vec::new();
     for config in configs {
         if config.is_absolute() {
@@ -1032,37 +1225,49 @@ fn expand_snippets(snippets_path: &PathBuf, matches: &ArgMatches, disabled: bool
         }
 
         // not absolute
-        let config = match config.extension() {
-            None => config.with_extension(expected_extension),
-            Some(extension) => {
-                if extension == expected_extension {
-                    config
-                } else {
-                    eprintln!(
-                        "File '{}' has an extension, but it is not the expected one ('.{}'), \
-                         ignoring",
-                        config.display(),
-                        expected_extension
-                    );
-                    continue;
-                }
+        // compare the whole suffix, extension() would only be "disabled" for "x.toml.disabled"
+        let config = match (config.to_str(), config.extension()) {
+            (Some(name), _) if name.ends_with(&expected_suffix) => config,
+            (_, None) => config.with_extension(expected_extension),
+            (_, Some(_)) => {
+                eprintln!(
+                    "File '{}' has an extension, but it is not the expected one ('{}'), ignoring",
+                    config.display(),
+                    expected_suffix
+                );
+                continue;
             }
         };
 
-        let mut abspath = PathBuf::from(snippets_path);
+        let snippets_path = match &resolved_snippets_path {
+            Some(path) => path,
+            None => resolved_snippets_path.insert(snippets_path(config_file)?),
+        };
+        let mut abspath = snippets_path.clone();
         abspath.push(config);
         paths.push(abspath);
     }
 
-    paths
+    Ok(paths)
 }
 
 fn promote_service(drbd_res: &str) -> String {
     format!("drbd-promote@{}.service", systemd::escape_name(drbd_res))
 }
 
+fn ocf_pattern() -> Result<&'static Regex> {
+    // only compiled once and only if needed, service_name() is called for every start entry
+    static OCF_REGEX: OnceLock<Regex> = OnceLock::new();
+    if let Some(regex) = OCF_REGEX.get() {
+        return Ok(regex);
+    }
+
+    let regex = Regex::new(plugin::promoter::OCF_PATTERN)?;
+    Ok(OCF_REGEX.get_or_init(|| regex))
+}
+
 fn service_name(start_entry: &str, drbd_res: &str) -> Result<String> {
-    let ocf_pattern = Regex::new(plugin::promoter::OCF_PATTERN)?;
+    let ocf_pattern = ocf_pattern()?;
     let start = start_entry.trim();
     let (service_name, _) = match ocf_pattern.captures(start) {
         Some(ocf) => {
@@ -1244,15 +1449,15 @@ fn do_remote(cluster: &ClusterConf) -> Result<bool> {
         cmds.push(node_args);
     }
     let results = pexec(&cmds)?;
+    let mut stdout = io::stdout().lock();
     for (i, result) in results.iter().enumerate() {
         if !result.status.success() {
             return Err(anyhow::anyhow!("Command '{}' failed", cmds[i].join(" ")));
         }
-        println!(
-            "➞ {}:\n{}",
-            nodes[i].hostname,
-            std::str::from_utf8(&result.stdout).unwrap_or("<Could not convert stdout>")
-        );
+        // pass the output through as is, no need to validate/convert it
+        writeln!(stdout, "➞ {}:", nodes[i].hostname)?;
+        stdout.write_all(&result.stdout)?;
+        writeln!(stdout)?;
     }
 
     Ok(true)
@@ -1521,20 +1726,38 @@ fn systemctl(args: Vec<String>) -> Result<()> {
     systemctl_out_err(args, Stdio::inherit(), Stdio::inherit())
 }
 
-fn status_dot(unit: &str) -> Result<String> {
-    let prop = systemd::show_property(unit, "ActiveState")?;
-    let state = UnitActiveState::from_str(&prop)?;
+// captures stdout and stderr (e.g., to not interleave output of parallel calls), keeps colors if we
+// are on a tty
+fn systemctl_output(args: Vec<String>) -> Result<Output> {
+    let mut cmd = Command::new("systemctl");
+    cmd.args(&args);
+    if stdout_is_tty() {
+        cmd.env("SYSTEMD_COLORS", "1");
+    }
+    Ok(cmd.output()?)
+}
+
+fn stdout_is_tty() -> bool {
+    static IS_TTY: OnceLock<bool> = OnceLock::new();
+    *IS_TTY.get_or_init(|| atty::is(atty::Stream::Stdout))
+}
+
+fn status_dot(props: &HashMap<String, String>) -> Result<String> {
+    let prop = props
+        .get("ActiveState")
+        .ok_or_else(|| anyhow::anyhow!("Could not get property 'ActiveState'"))?;
+    let state = UnitActiveState::from_str(prop)?;
     Ok(format!("{}", state))
 }
 
-fn freezer_state(unit: &str) -> Result<String> {
+fn freezer_state(props: &HashMap<String, String>) -> Result<String> {
     // we can not always expect a value on older systemd that did not have freeze support
-    // in that case we get an Err() which we discard.
-    let prop = match systemd::show_property(unit, "FreezerState") {
-        Ok(x) => x,
-        Err(_) => return Ok("".into()),
+    // in that case the property is missing, which we treat as nothing to report.
+    let prop = match props.get("FreezerState") {
+        Some(x) => x,
+        None => return Ok("".into()),
     };
-    let state = UnitFreezerState::from_str(&prop)?;
+    let state = UnitFreezerState::from_str(prop)?;
     Ok(format!("{}", state))
 }
 
@@ -1,4 +1,5 @@
 use std::net::{Ipv4Addr, Ipv6Addr, SocketAddr, ToSocketAddrs};
+use std::os::unix::ffi::OsStrExt;
 use std::path::{Path, PathBuf};
 use std::{fmt, fs};
 
@@ -122,20 +123,31 @@ pub fn files_with_extension_in(path: &PathBuf, extension: &str) -> Result<Vec<Pa
     let mut files = Vec::new();
     let extension = ".".to_owned() + extension;
     for entry in fs::read_dir(path)? {
-        let path = match entry {
-            Ok(e) => e.path(),
+        let entry = match entry {
+            Ok(e) => e,
             _ => continue,
         };
-        if !path.is_file() {
+        // filter by name first, this does not need any further syscalls
+        if !entry.file_name().as_bytes().ends_with(extension.as_bytes()) {
             continue;
         }
-        let path_str = path.to_str().ok_or(anyhow::anyhow!(
-            "Could not convert '{}' to str",
-            path.display()
-        ))?;
-        if !path_str.ends_with(&extension) {
+        // the file type is usually already known from the directory entry, only symlinks need a
+        // stat() to check what they point to
+        let path = entry.path();
+        let is_file = match entry.file_type() {
+            Ok(t) if t.is_symlink() => path.is_file(),
+            Ok(t) => t.is_file(),
+            _ => continue,
+        };
+        if !is_file {
             continue;
         }
+        if path.to_str().is_none() {
+            return Err(anyhow::anyhow!(
+                "Could not convert '{}' to str",
+                path.display()
+            ));
+        }
         files.push(path);
     }
 
@@ -207,6 +219,33 @@ mod tests {
         assert_eq!(addr.address, LocalAddress::Unspecified(9999))
     }
 
+    #[test]
+    fn test_files_with_extension_in() {
+        let dir = tempfile::tempdir().expect("must create tempdir");
+        let dir_path = dir.path().to_path_buf();
+        for name in &["b.toml", "a.toml", "c.toml.disabled", "d.txt"] {
+            fs::write(dir_path.join(name), "").expect("must write file");
+        }
+        fs::create_dir(dir_path.join("e.toml")).expect("must create dir");
+        std::os::unix::fs::symlink(dir_path.join("a.toml"), dir_path.join("f.toml"))
+            .expect("must create symlink");
+        std::os::unix::fs::symlink(dir_path.join("e.toml"), dir_path.join("g.toml"))
+            .expect("must create symlink");
+
+        let files = files_with_extension_in(&dir_path, "toml").expect("must list files");
+        assert_eq!(
+            files,
+            vec![
+                dir_path.join("a.toml"),
+                dir_path.join("b.toml"),
+                dir_path.join("f.toml")
+            ]
+        );
+
+        let files = files_with_extension_in(&dir_path, "toml.disabled").expect("must list files");
+        assert_eq!(files, vec![dir_path.join("c.toml.disabled")]);
+    }
+
     #[test]
     fn test_local_address_err() {
         let addr: Result<AddressTest, _> = toml::from_str(LOCAL_ADDRESS_ERR);
@@ -1,3 +1,4 @@
+use std::collections::HashMap;
 use std::fmt;
 use std::io::{Error, ErrorKind};
 use std::process::Command;
@@ -70,6 +71,49 @@ impl fmt::Display for UnitActiveState {
     }
 }
 
+// like show_property(), but for multiple units and properties with a single systemctl call
+// the result contains one map of properties per unit, in the order the units were given
+pub fn show_properties(
+    units: &[String],
+    properties: &[&str],
+) -> Result<Vec<HashMap<String, String>>> {
+    let output = Command::new("systemctl")
+        .arg("show")
+        .arg(format!("--property={}", properties.join(",")))
+        .args(units)
+        .output()?;
+    let output = std::str::from_utf8(&output.stdout)?;
+    let props = parse_properties(output);
+    if props.len() != units.len() {
+        return Err(anyhow::anyhow!(
+            "Expected properties for {} units, got {}",
+            units.len(),
+            props.len()
+        ));
+    }
+    Ok(props)
+}
+
+// systemctl show separates the properties of multiple units by an empty line
+fn parse_properties(output: &str) -> Vec<HashMap<String, String>> {
+    output
+        .split("\n\n")
+        .filter(|block| !block.trim().is_empty())
+        .map(|block| {
+            block
+                .lines()
+                .filter_map(|line| {
+                    let mut split = line.splitn(2, '=');
+                    match (split.next(), split.next()) {
+                        (Some(k), Some(v)) => Some((k.to_string(), v.trim().to_string())),
+                        _ => None,
+                    }
+                })
+                .collect()
+        })
+        .collect()
+}
+
 pub fn is_active(unit: &str) -> Result<bool> {
     let prop = show_property(unit, "ActiveState")?;
     let state = UnitActiveState::from_str(&prop)?;
@@ -118,49 +162,39 @@ pub fn escaped_services_target(name: &str) -> String {
 
 // inlined copy from https://crates.io/crates/libsystemd
 // inlined because currently not packaged in Ubuntu Focal
+// modified to write into a single buffer instead of allocating a String per byte
 pub fn escape_name(name: &str) -> String {
-    if name.is_empty() {
-        return "".to_string();
+    let mut escaped = String::with_capacity(name.len());
+    for (n, b) in name.bytes().enumerate() {
+        escape_byte(&mut escaped, b, n);
     }
-
-    let parts: Vec<String> = name
-        .bytes()
-        .enumerate()
-        .map(|(n, b)| escape_byte(b, n))
-        .collect();
-    parts.join("")
+    escaped
 }
 
 // inlined copy from https://crates.io/crates/libsystemd
 // inlined because currently not packaged in Ubuntu Focal
-fn escape_byte(b: u8, index: usize) -> String {
+fn escape_byte(escaped: &mut String, b: u8, index: usize) {
     let c = char::from(b);
     match c {
-        '/' => '-'.to_string(),
-        ':' | '_' | '0'..='9' | 'a'..='z' | 'A'..='Z' => c.to_string(),
-        '.' if index > 0 => c.to_string(),
-        _ => format!(r#"\x{:02x}"#, b),
+        '/' => escaped.push('-'),
+        ':' | '_' | '0'..='9' | 'a'..='z' | 'A'..='Z' => escaped.push(c),
+        '.' if index > 0 => escaped.push(c),
+        _ => escaped.push_str(&format!(r#"\x{:02x}"#, b)),
     }
 }
 
 // this is a relaxed version of escape_{name,byte}, for example we don't want '/' to be replaced
 // this can be optimized to really just escape what is strictly needed, but IMO fine as is
 fn escape_env(name: &str) -> String {
-    if name.is_empty() {
-        return "".to_string();
+    let mut escaped = String::with_capacity(name.len());
+    for b in name.bytes() {
+        let c = char::from(b);
+        match c {
+            '.' | '/' | ':' | '_' | '0'..='9' | 'a'..='z' | 'A'..='Z' => escaped.push(c),
+            _ => escaped.push_str(&format!(r#"\x{:02x}"#, b)),
+        }
     }
-
-    let parts: Vec<String> = name
-        .bytes()
-        .map(|b| {
-            let c = char::from(b);
-            match c {
-                '.' | '/' | ':' | '_' | '0'..='9' | 'a'..='z' | 'A'..='Z' => c.to_string(),
-                _ => format!(r#"\x{:02x}"#, b),
-            }
-        })
-        .collect();
-    parts.join("")
+    escaped
 }
 
 #[test]
@@ -193,3 +227,28 @@ fn test_ocf_parse_to_env() {
 
     assert_eq!(name, "ocf.rs@name\\x2d1_res\\x2d1.service");
 }
+
+#[test]
+fn test_escape_name() {
+    assert_eq!(escape_name(""), "");
+    assert_eq!(escape_name("res1"), "res1");
+    assert_eq!(escape_name("/dev/drbd1000"), "-dev-drbd1000");
+    assert_eq!(escape_name(".res.1"), "\\x2eres.1");
+    assert_eq!(escape_name("res-ä"), "res\\x2d\\xc3\\xa4");
+}
+
+#[test]
+fn test_parse_properties() {
+    let props = parse_properties(
+        "ActiveState=active\nFreezerState=running\n\nActiveState=inactive\n\nFreezerState=frozen\nActiveState=failed\n",
+    );
+    assert_eq!(props.len(), 3);
+    assert_eq!(props[0].get("ActiveState").unwrap(), "active");
+    assert_eq!(props[0].get("FreezerState").unwrap(), "running");
+    assert_eq!(props[1].get("ActiveState").unwrap(), "inactive");
+    assert_eq!(props[1].get("FreezerState"), None);
+    assert_eq!(props[2].get("ActiveState").unwrap(), "failed");
+    assert_eq!(props[2].get("FreezerState").unwrap(), "frozen");
+
+    assert!(parse_properties("").is_empty());
+}